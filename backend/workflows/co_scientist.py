@@ -1,10 +1,23 @@
 from dotenv import load_dotenv
 import asyncio
-from dataclasses import dataclass
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import date
 from typing import Literal
 
-from agents import Agent, ItemHelpers, MessageOutputItem, Runner, trace, TResponseInputItem, WebSearchTool
-from openai.types.responses import ResponseContentPartDoneEvent, ResponseTextDeltaEvent
+import httpx
+import numpy as np
+from agents import Agent, MessageOutputItem, Runner, trace, TResponseInputItem, WebSearchTool
+from agents import ModelSettings, function_tool, set_default_openai_client
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from openai.types.responses import ResponseContentPartDoneEvent, ResponseOutputText, ResponseTextDeltaEvent
 from agents import RawResponsesStreamEvent
 
 load_dotenv()
@@ -13,6 +26,29 @@ load_dotenv()
 Co-Scientist System Implementation
 """
 
+# Shared OpenAI client, created on first use so the API key is read after load_dotenv()
+_openai_client: AsyncOpenAI | None = None
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the pooled HTTP/2 client shared by every agent"""
+    global _openai_client
+    if _openai_client is None:
+        http_client = DefaultAsyncHttpxClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+        _openai_client = AsyncOpenAI(http_client=http_client)
+        set_default_openai_client(_openai_client)
+    return _openai_client
+
+async def warm_up_openai_client():
+    """Open a pooled connection to the API so the first agent call skips connection setup"""
+    try:
+        await asyncio.wait_for(get_openai_client().models.list(), timeout=5)
+    except Exception:
+        # Warm-up is best effort; real failures surface on the first agent call
+        pass
+
 # Define specialized agents
 generation_agent = Agent(
     name="generation_agent",
@@ -29,6 +65,42 @@ generation_agent = Agent(
     tools=[WebSearchTool()],
 )
 
+# Searches once on behalf of parallel generation calls, so each call does not repeat the same crawl
+literature_scout_agent = Agent(
+    name="literature_scout_agent",
+    instructions=(
+        "You are a Literature Scout agent. Search the web for the most recent and relevant research related to "
+        "the research goal and return a compact summary of the key papers, findings, and open questions, "
+        "including citations. Do not propose hypotheses yourself."
+    ),
+    tools=[WebSearchTool()],
+)
+
+# Generation agent for prompts that already carry the scout's literature summary
+generation_agent_no_search = generation_agent.clone(
+    instructions=(
+        "You are a Generation agent that initiates the research process by generating initial focus areas, "
+        "extending them, and generating hypotheses that address the research goal. Explore the literature context "
+        "provided in the request, synthesize existing findings into novel directions, and engage in simulated "
+        "scientific debates for iterative improvement. Return a list of innovative hypotheses related to the research goal."
+        "\n\nWeb search is not available. Treat the literature context as your summary of the latest research and "
+        "findings related to the research goal. Use it to inform your hypothesis generation, ensuring they reflect "
+        "current scientific understanding and identify potential gaps in existing research."
+    ),
+    tools=[],
+)
+
+# Define dataclasses for the structured hypothesis selection
+@dataclass
+class Hypothesis:
+    id: str
+    statement: str
+    rationale: str
+
+@dataclass
+class SelectedHypotheses:
+    items: list[Hypothesis]
+
 # Create a specialized agent for hypothesis selection
 hypothesis_selector_agent = Agent(
     name="hypothesis_selector_agent",
@@ -37,8 +109,11 @@ hypothesis_selector_agent = Agent(
         "promising ones. Review all provided hypotheses and select the most promising, diverse, and innovative "
         "candidates. Provide a consolidated list of the strongest and most diverse hypotheses, and explain why "
         "you selected each one. Aim to select 3-5 hypotheses that together represent the strongest research directions."
+        "\n\nFor each selected hypothesis, give a short id (H1, H2, ...), the full hypothesis statement, and the "
+        "rationale for selecting it."
     ),
     handoff_description="Selects the most promising hypotheses from multiple generated sets",
+    output_type=SelectedHypotheses,
 )
 
 reflection_agent = Agent(
@@ -67,15 +142,57 @@ ranking_agent = Agent(
     handoff_description="Ranks hypotheses through tournament-style evaluation",
 )
 
-proximity_agent = Agent(
-    name="proximity_agent",
-    instructions=(
-        "You are a Proximity agent that computes a proximity graph for generated hypotheses. Identify clusters "
-        "of similar ideas, perform de-duplication, and enable efficient exploration of the hypothesis landscape. "
-        "Provide a map of how hypotheses relate to each other in the research space."
-    ),
-    handoff_description="Maps relationships between hypotheses",
-)
+# Embedding model and cosine similarity above which two hypotheses are clustered together
+PROXIMITY_EMBEDDING_MODEL = "text-embedding-3-small"
+PROXIMITY_THRESHOLD = 0.82
+
+@function_tool
+async def map_hypothesis_relationships(hypotheses: list[str]) -> str:
+    """
+    Analyze relationships and similarities between hypotheses, clustering similar ideas and flagging near-duplicates.
+
+    Args:
+        hypotheses: The hypotheses to compare, one full hypothesis statement per entry.
+    """
+    hypotheses = [h.strip() for h in hypotheses if h.strip()]
+    if len(hypotheses) < 2:
+        return "At least two hypotheses are needed to map relationships."
+    
+    # One embedding request for all hypotheses, then cosine similarity as a single matrix product
+    async with _tool_semaphore, _total_semaphore:
+        response = await get_openai_client().embeddings.create(model=PROXIMITY_EMBEDDING_MODEL, input=hypotheses)
+    embeddings = np.asarray([d.embedding for d in response.data], dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    similarity = embeddings @ embeddings.T
+    
+    # Clusters are the connected components of the thresholded similarity graph
+    adjacency = similarity > PROXIMITY_THRESHOLD
+    labels = np.full(len(hypotheses), -1)
+    num_clusters = 0
+    for start in range(len(hypotheses)):
+        if labels[start] >= 0:
+            continue
+        labels[start] = num_clusters
+        stack = [start]
+        while stack:
+            neighbors = np.flatnonzero(adjacency[stack.pop()] & (labels < 0))
+            labels[neighbors] = num_clusters
+            stack.extend(neighbors.tolist())
+        num_clusters += 1
+    
+    lines = [f"{num_clusters} clusters among {len(hypotheses)} hypotheses (cosine similarity > {PROXIMITY_THRESHOLD}):"]
+    for cluster in range(num_clusters):
+        members = np.flatnonzero(labels == cluster)
+        label = "similar ideas" if len(members) > 1 else "distinct"
+        lines.append(f"\nCluster {cluster + 1} ({label}):")
+        lines.extend(f"- [H{i + 1}] {hypotheses[i]}" for i in members)
+    
+    # Closest pairs overall, to show how the hypotheses relate across clusters
+    rows, cols = np.triu_indices(len(hypotheses), k=1)
+    closest = np.argsort(similarity[rows, cols])[::-1][:5]
+    lines.append("\nClosest pairs:")
+    lines.extend(f"- H{rows[k] + 1} ~ H{cols[k] + 1}: {similarity[rows[k], cols[k]]:.2f}" for k in closest)
+    return "\n".join(lines)
 
 evolution_agent = Agent(
     name="evolution_agent",
@@ -126,6 +243,16 @@ hypothesis_evaluator = Agent[None](
     tools=[WebSearchTool()],
 )
 
+# Agent.as_tool calls Runner.run directly, so supervisor tool runs would bypass the concurrency limits
+def agent_tool(agent, tool_name, tool_description):
+    """Expose an agent as a supervisor tool whose runs go through bounded_run"""
+    @function_tool(name_override=tool_name, description_override=tool_description)
+    async def run_agent(input: str) -> str:
+        async with _tool_semaphore:
+            result = await bounded_run(agent, input)
+        return message_text(result.new_items)
+    return run_agent
+
 # Supervisor agent with parallel hypothesis generation capability
 supervisor_agent = Agent(
     name="supervisor_agent",
@@ -139,54 +266,151 @@ supervisor_agent = Agent(
         "\n5. Guide the iterative improvement of hypotheses"
         "\n6. Synthesize final results into a comprehensive research overview"
         "\nYou should always use your tools rather than attempting to perform their functions yourself."
+        "\nWhen several tools can work on the same hypotheses independently (for example reviewing, ranking and "
+        "mapping relationships), call them together in a single step so they run concurrently."
     ),
+    # Let the model emit several tool calls per turn; the runner executes them concurrently
+    model_settings=ModelSettings(parallel_tool_calls=True),
     tools=[
-        generation_agent.as_tool(
+        agent_tool(
+            generation_agent,
             tool_name="generate_hypotheses",
             tool_description="Generate initial hypotheses for the research goal",
         ),
-        hypothesis_selector_agent.as_tool(
+        agent_tool(
+            hypothesis_selector_agent,
             tool_name="select_hypotheses",
             tool_description="Select the most promising hypotheses from multiple sets",
         ),
-        reflection_agent.as_tool(
+        agent_tool(
+            reflection_agent,
             tool_name="review_hypotheses",
             tool_description="Review and provide feedback on the proposed hypotheses",
         ),
-        ranking_agent.as_tool(
+        agent_tool(
+            ranking_agent,
             tool_name="rank_hypotheses",
             tool_description="Rank hypotheses through tournament-style evaluation",
         ),
-        proximity_agent.as_tool(
-            tool_name="map_hypothesis_relationships",
-            tool_description="Analyze relationships and similarities between hypotheses",
-        ),
-        evolution_agent.as_tool(
+        map_hypothesis_relationships,
+        agent_tool(
+            evolution_agent,
             tool_name="refine_hypotheses",
             tool_description="Refine and improve promising hypotheses",
         ),
-        meta_review_agent.as_tool(
+        agent_tool(
+            meta_review_agent,
             tool_name="synthesize_research",
             tool_description="Create a comprehensive research overview from top hypotheses",
         ),
     ],
 )
 
+# Prompt templates. Every prompt starts with the same research-goal prefix, so repeated calls to an
+# agent send byte-identical leading tokens and can hit the provider's prompt prefix cache.
+RESEARCH_GOAL_PREFIX = "Research Goal: {research_goal}\n"
+GENERATION_SET_DIRECTIVES = (
+    "Generation Set #1: Generate innovative and diverse hypotheses. First, search the web for recent research related to this goal to inform your hypotheses.",
+    "Generation Set #2: Focus on potentially transformative hypotheses. Use web search to find cutting-edge research in this area before generating your hypotheses.",
+    "Generation Set #3: Consider unconventional approaches to the research goal. Search the web for emerging or cross-disciplinary approaches to this research area.",
+)
+# Variants for prompts that already carry the literature scout's summary
+GENERATION_SET_DIRECTIVES_NO_SEARCH = (
+    "Generation Set #1: Generate innovative and diverse hypotheses, informed by the recent research in the literature context.",
+    "Generation Set #2: Focus on potentially transformative hypotheses that build on the cutting-edge research in the literature context.",
+    "Generation Set #3: Consider unconventional approaches to the research goal, drawing on emerging or cross-disciplinary work in the literature context.",
+)
+BATCHED_GENERATION_DIRECTIVE = (
+    "Generate three independent sets of hypotheses. First, search the web for recent research related to "
+    "this goal to inform all three sets."
+    "\nSet #1: Generate innovative and diverse hypotheses."
+    "\nSet #2: Focus on potentially transformative hypotheses grounded in cutting-edge research."
+    "\nSet #3: Consider unconventional approaches, including emerging or cross-disciplinary research."
+    "\nStart each set on its own line with the marker ===SET n=== where n is the set number (1, 2 or 3)."
+    "\nAfter the three sets, output the marker ===SELECTION=== on its own line, followed only by a JSON array of "
+    "the 3-5 most promising, diverse, and innovative hypotheses across all sets. Each element is an object with "
+    "the keys \"id\" (H1, H2, ...), \"statement\" (the full hypothesis) and \"rationale\" (why you selected it)."
+)
+EVALUATION_TEMPLATE = RESEARCH_GOAL_PREFIX + "\nHypotheses:\n{hypotheses}"
+SELECTION_TEMPLATE = (
+    RESEARCH_GOAL_PREFIX
+    + "\nGenerated Hypotheses:\n{hypotheses}\n\nPlease select and consolidate the most promising hypotheses."
+)
+SUPERVISOR_TEMPLATE = (
+    RESEARCH_GOAL_PREFIX
+    + "\nActive Research Hypotheses:\n{hypotheses}\n\nPlease continue the research process with these hypotheses."
+)
+
+def message_text(items) -> str:
+    """Concatenate the text of all message outputs in a single pass"""
+    return "".join(
+        part.text
+        for item in items if isinstance(item, MessageOutputItem)
+        for part in item.raw_item.content if isinstance(part, ResponseOutputText)
+    )
+
+# Per-agent and account-wide caps on concurrent runs, to stay under provider rate limits
+AGENT_CONCURRENCY = int(os.getenv("COSCI_AGENT_CONCURRENCY", "3"))
+TOTAL_CONCURRENCY = int(os.getenv("COSCI_TOTAL_CONCURRENCY", "8"))
+_agent_semaphores: defaultdict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(AGENT_CONCURRENCY))
+_total_semaphore = asyncio.Semaphore(TOTAL_CONCURRENCY)
+
+# Cap on supervisor tool calls in flight at once, since parallel tool calls can fan out without limit
+TOOL_CONCURRENCY = int(os.getenv("COSCI_TOOL_CONCURRENCY", "4"))
+_tool_semaphore = asyncio.Semaphore(TOOL_CONCURRENCY)
+
+async def bounded_run(agent, input):
+    """Run an agent within its own and the account-wide concurrency limits"""
+    async with _agent_semaphores[agent.name], _total_semaphore:
+        return await Runner.run(agent, input)
+
+def context_window(items, round_start):
+    """Keep the initial research-goal message plus every item of the latest round, which begins at round_start"""
+    # Cutting on round boundaries keeps each web search call next to the reasoning item it depends on
+    return items[:1] + items[round_start:]
+
+# Citations from the last three years, counted as evidence of current research: recent arXiv IDs, dated
+# bioRxiv/medRxiv DOIs, and author-year citations such as "(Smith et al., 2025)", "[Lee & Park, 2024]" or
+# "Smith et al. (2025)". Bare years like "pilot in 2025" are not citations and don't count.
+_recent_years = range(date.today().year - 2, date.today().year + 1)
+_recent_year = "(?:" + "|".join(str(year) for year in _recent_years) + ")"
+_author = r"[A-Z][^\W\d_]*(?:['\-][^\W\d_]+)*"
+RECENT_CITATION_PATTERN = re.compile(
+    r"arXiv:(?:" + "|".join(f"{year % 100:02d}" for year in _recent_years) + r")\d{2}\.\d{4,5}"
+    r"|\b10\.1101/" + _recent_year + r"\.\d{2}\.\d{2}\.\d+"
+    r"|(?:[(\[]|; )" + _author + r"(?: et al\.?,?| (?:&|and) " + _author + r",?|,) " + _recent_year + r"[a-z]?(?=[;)\]])"
+    r"|\b" + _author + r"(?: et al\.?| (?:&|and) " + _author + r") \(" + _recent_year + r"[a-z]?\)"
+)
+RECENT_CITATION_THRESHOLD = 3
+
 async def evaluate_and_refine_hypotheses(research_goal, initial_hypotheses):
     """Iteratively evaluate and refine hypotheses until all are in active research areas"""
     print("\n--- Evaluating if hypotheses are in active research areas ---\n")
     
+    # Nothing to evaluate, so skip the evaluator and reflection calls entirely
+    if not initial_hypotheses or not initial_hypotheses.strip():
+        print("No hypotheses to evaluate. Skipping evaluation.")
+        return initial_hypotheses
+    
+    # Hypotheses that already cite several distinct recent papers are taken as current without an evaluator call
+    recent_citations = len({match.group().lstrip("([; ") for match in RECENT_CITATION_PATTERN.finditer(initial_hypotheses)})
+    if recent_citations >= RECENT_CITATION_THRESHOLD:
+        print(f"Found {recent_citations} recent citations. Skipping evaluation.")
+        return initial_hypotheses
+    
     current_hypotheses = initial_hypotheses
     iteration = 1
     input_items: list[TResponseInputItem] = [
-        {"content": f"Research Goal: {research_goal}\n\nHypotheses:\n{current_hypotheses}", "role": "user"}
+        {"content": EVALUATION_TEMPLATE.format_map({"research_goal": research_goal, "hypotheses": current_hypotheses}), "role": "user"}
     ]
+    round_start = len(input_items)
     
     while True:
         print(f"\nEvaluation iteration #{iteration}")
         
-        # Evaluate if hypotheses are in active research areas
-        evaluation_result = await Runner.run(hypothesis_evaluator, input_items)
+        # Evaluate if hypotheses are in active research areas.
+        # Both agents only see the original request and the latest round, not the whole history.
+        evaluation_result = await bounded_run(hypothesis_evaluator, context_window(input_items, round_start))
         evaluation: HypothesisEvaluation = evaluation_result.final_output
         
         print(f"\nEvaluation status: {evaluation.status}")
@@ -197,17 +421,22 @@ async def evaluate_and_refine_hypotheses(research_goal, initial_hypotheses):
             print("\nAll hypotheses are in active research areas. Moving forward.")
             break
         
-        print("\nRefining hypotheses based on evaluation feedback...")
+        # A needs_refinement verdict naming no outdated areas gives the reflection agent nothing to act on
+        if not evaluation.outdated_areas or not evaluation.feedback.strip():
+            print("\nNo outdated areas identified. Treating hypotheses as active and moving forward.")
+            break
         
-        # Add feedback to the input for reflection agent
-        input_items.append({"content": f"Feedback on research currency: {evaluation.feedback}", "role": "user"})
+        print("\nRefining hypotheses based on evaluation feedback...")
         
-        # Run reflection agent to refine hypotheses
-        reflection_result = await Runner.run(reflection_agent, input_items)
+        # Run reflection agent to refine hypotheses against this round's feedback
+        feedback_item: TResponseInputItem = {"content": f"Feedback on research currency: {evaluation.feedback}", "role": "user"}
+        reflection_result = await bounded_run(reflection_agent, [*context_window(input_items, round_start), feedback_item])
         
-        # Update current hypotheses
-        input_items = reflection_result.to_input_list()
-        current_hypotheses = ItemHelpers.text_message_outputs(reflection_result.new_items)
+        # Update current hypotheses, appending only this round's items instead of rebuilding the history
+        round_start = len(input_items)
+        input_items.append(feedback_item)
+        input_items.extend(item.to_input_item() for item in reflection_result.new_items)
+        current_hypotheses = message_text(reflection_result.new_items)
         
         print(f"\nRefined hypotheses (iteration #{iteration}):\n{current_hypotheses}")
         
@@ -218,41 +447,213 @@ async def evaluate_and_refine_hypotheses(research_goal, initial_hypotheses):
     
     return current_hypotheses
 
+# Markers separating the hypothesis sets and the fused selection in a batched generation response.
+# Models often wrap them in Markdown (**===SET 1===**, ## ===SELECTION===), so surrounding */#/_ is consumed too.
+# Both must sit on their own line, so a hypothesis that mentions a marker inline is not split.
+SET_MARKER_PATTERN = re.compile(r"^[#*_ \t]*===[ \t]*SET[ \t]+\d+[ \t]*===[*_ \t]*$", re.MULTILINE)
+SELECTION_MARKER_PATTERN = re.compile(r"^[#*_ \t]*===[ \t]*SELECTION[ \t]*===[*_ \t]*$", re.MULTILINE)
+
+# Code fence a model may wrap around the fused selection's JSON
+CODE_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+def parse_selection(text) -> SelectedHypotheses | None:
+    """Parse the fused selection's JSON array, returning None if it is malformed or empty"""
+    try:
+        items = [
+            Hypothesis(id=str(item["id"]), statement=item["statement"], rationale=item["rationale"])
+            for item in json.loads(CODE_FENCE_PATTERN.sub("", text.strip()))
+        ]
+    except (ValueError, TypeError, KeyError):
+        return None
+    return SelectedHypotheses(items=items) if items else None
+
+def format_selection(selection: SelectedHypotheses) -> str:
+    """Render selected hypotheses as the JSON passed to later prompts"""
+    return json.dumps([asdict(hypothesis) for hypothesis in selection.items], indent=2, ensure_ascii=False)
+
+async def generate_hypothesis_sets_batched(research_goal):
+    """Generate three sets of hypotheses and a selection across them in a single generation call"""
+    result = await bounded_run(
+        generation_agent,
+        RESEARCH_GOAL_PREFIX.format(research_goal=research_goal) + BATCHED_GENERATION_DIRECTIVE,
+    )
+    output = message_text(result.new_items)
+    
+    # Only trust the fused selection when exactly one well-formed marker is present
+    selection = None
+    parts = SELECTION_MARKER_PATTERN.split(output)
+    if len(parts) == 2 and parts[1].strip():
+        output, selection = parts[0], parts[1].strip()
+    
+    # Fall back to a single set if the model ignored the set markers
+    sets = [part.strip() for part in SET_MARKER_PATTERN.split(output)[1:] if part.strip()]
+    return sets or [output], selection
+
+async def generate_hypothesis_sets_parallel(research_goal):
+    """Generate three sets of hypotheses with three parallel generation calls, also returning how many were dropped"""
+    # Search once up front and share the summary, instead of three independent web searches
+    try:
+        scout_result = await bounded_run(
+            literature_scout_agent,
+            f"Summarize the 10 most relevant recent papers and findings on: {research_goal}",
+        )
+        context = f"Literature context:\n{scout_result.final_output}\n\n"
+        agent, directives = generation_agent_no_search, GENERATION_SET_DIRECTIVES_NO_SEARCH
+    except Exception as e:
+        print(f"Literature scout failed ({e}); generating with web search instead.")
+        context = ""
+        agent, directives = generation_agent, GENERATION_SET_DIRECTIVES
+    
+    prefix = context + RESEARCH_GOAL_PREFIX.format(research_goal=research_goal)
+    tasks = [
+        asyncio.create_task(bounded_run(agent, prefix + directive))
+        for directive in directives
+    ]
+    
+    # Extract each set as soon as it finishes. With COSCI_QUORUM=1, once two sets are in,
+    # the last one gets 1.5x their median latency before it is dropped.
+    quorum = os.getenv("COSCI_QUORUM") == "1"
+    started = time.monotonic()
+    durations = []
+    hypothesis_sets = {}
+    pending = set(tasks)
+    try:
+        while pending:
+            timeout = None
+            if quorum and len(hypothesis_sets) >= 2:
+                timeout = max(0.0, statistics.median(durations) * 1.5 - (time.monotonic() - started))
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                print("Third hypothesis set omitted due to latency.")
+                break
+            for task in done:
+                hypothesis_sets[task] = message_text(task.result().new_items)
+                durations.append(time.monotonic() - started)
+    finally:
+        for task in pending:
+            task.cancel()
+    
+    return [hypothesis_sets[task] for task in tasks if task in hypothesis_sets], len(pending)
+
 async def generate_hypotheses_in_parallel(research_goal):
-    """Generate three sets of hypotheses in parallel"""
-    print("\n--- Generating hypotheses in parallel ---\n")
+    """Generate three sets of hypotheses and select the most promising ones"""
+    print("\n--- Generating hypotheses ---\n")
     
-    hypothesis_results = await asyncio.gather(
-        Runner.run(generation_agent, f"Research Goal: {research_goal}\nGeneration Set #1: Generate innovative and diverse hypotheses. First, search the web for recent research related to this goal to inform your hypotheses."),
-        Runner.run(generation_agent, f"Research Goal: {research_goal}\nGeneration Set #2: Focus on potentially transformative hypotheses. Use web search to find cutting-edge research in this area before generating your hypotheses."),
-        Runner.run(generation_agent, f"Research Goal: {research_goal}\nGeneration Set #3: Consider unconventional approaches to the research goal. Search the web for emerging or cross-disciplinary approaches to this research area.")
-    )
+    # One batched call shares the prompt prefix and web search across sets;
+    # COSCI_PARALLEL_GENERATION=1 restores three separate calls for providers that handle long responses poorly
+    omitted_sets = 0
+    if os.getenv("COSCI_PARALLEL_GENERATION") == "1":
+        generated_sets, omitted_sets = await generate_hypothesis_sets_parallel(research_goal)
+    else:
+        generated_sets, selection_text = await generate_hypothesis_sets_batched(research_goal)
+        selection = parse_selection(selection_text) if selection_text else None
+        if selection:
+            return format_selection(selection)
+        print("Generation response had no usable selection; running the selector agent.")
     
-    # Extract outputs from each generation
+    # Label each generated set
     hypothesis_sets = []
-    for i, result in enumerate(hypothesis_results, 1):
-        hypotheses = ItemHelpers.text_message_outputs(result.new_items)
+    for i, hypotheses in enumerate(generated_sets, 1):
         hypothesis_sets.append(f"Hypothesis Set #{i}:\n{hypotheses}")
     
     # Join the sets with separators
     all_hypotheses = "\n\n".join(hypothesis_sets)
+    # Tell the selector a set is missing, so it doesn't read the gap as a lack of ideas
+    if omitted_sets:
+        all_hypotheses += f"\n\nNote: {omitted_sets} of {len(GENERATION_SET_DIRECTIVES)} hypothesis sets omitted due to latency."
     
     # Select the best hypotheses using the selector agent
-    selection_result = await Runner.run(
+    selection_result = await bounded_run(
         hypothesis_selector_agent,
-        f"Research Goal: {research_goal}\n\nGenerated Hypotheses:\n{all_hypotheses}\n\nPlease select and consolidate the most promising hypotheses."
+        SELECTION_TEMPLATE.format_map({"research_goal": research_goal, "hypotheses": all_hypotheses}),
     )
+    selection: SelectedHypotheses = selection_result.final_output
+    
+    # Re-inject the selection into later prompts as compact structured data rather than prose
+    return format_selection(selection)
+
+# Minimum seconds between stdout flushes while streaming
+STREAM_FLUSH_INTERVAL = 0.05
+
+# State shared by the stream event handlers
+@dataclass(slots=True)
+class StreamState:
+    current_agent: str
+    last_flush: float
+
+def handle_text_delta(data: ResponseTextDeltaEvent, state: StreamState):
+    """Write a streamed delta, flushing stdout at most every STREAM_FLUSH_INTERVAL"""
+    sys.stdout.write(data.delta)
+    now = time.monotonic()
+    if now - state.last_flush > STREAM_FLUSH_INTERVAL:
+        sys.stdout.flush()
+        state.last_flush = now
+
+def handle_content_part_done(data: ResponseContentPartDoneEvent, state: StreamState):
+    """Finish a content part and flush whatever is buffered"""
+    sys.stdout.write("\n\n")
+    sys.stdout.flush()
+    state.last_flush = time.monotonic()
+
+# Raw response event handlers, dispatched on the exact event type
+STREAM_HANDLERS = {
+    ResponseTextDeltaEvent: handle_text_delta,
+    ResponseContentPartDoneEvent: handle_content_part_done,
+}
+
+async def read_input(prompt):
+    """Read a line from stdin without blocking the event loop"""
+    # A daemon thread rather than asyncio.to_thread, since asyncio.run joins executor threads on shutdown and a
+    # blocked input() would keep Ctrl-C at the prompt from exiting. The thread reads the raw file descriptor,
+    # because a daemon thread blocked inside sys.stdin holds its buffer lock and aborts interpreter shutdown.
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    fd = sys.stdin.fileno()
+    encoding = sys.stdin.encoding or "utf-8"
+    
+    def resolve(set_outcome, value):
+        if not future.done():
+            set_outcome(value)
     
-    return selection_result.final_output
+    def read():
+        data = b""
+        try:
+            while b"\n" not in data:
+                chunk = os.read(fd, 4096)
+                if not chunk:
+                    break
+                data += chunk
+        except OSError as e:
+            loop.call_soon_threadsafe(resolve, future.set_exception, e)
+            return
+        if not data:
+            loop.call_soon_threadsafe(resolve, future.set_exception, EOFError())
+            return
+        line = data.split(b"\n", 1)[0].decode(encoding, errors="replace").rstrip("\r")
+        loop.call_soon_threadsafe(resolve, future.set_result, line)
+    
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    threading.Thread(target=read, daemon=True).start()
+    return await future
 
 async def main():
-    # Get research goal from user
-    research_goal = input("Enter your scientific research goal: ")
+    # Route all agents through the shared pooled client and warm it up while the user types
+    get_openai_client()
+    warmup_task = asyncio.create_task(warm_up_openai_client())
+
+    # Get research goal from user without blocking the event loop
+    research_goal = await read_input("Enter your scientific research goal: ")
+    if not research_goal.strip():
+        warmup_task.cancel()
+        print("No research goal provided. Exiting.")
+        return
+    # The warm-up keeps running in the background rather than delaying the first agent call
     
     # Run the entire orchestration in a single trace
     with trace("Co-Scientist workflow"):
-        # Generate hypotheses in parallel
-        print("\nGenerating hypotheses in parallel...\n")
+        # Generate hypotheses and select the most promising ones
+        print("\nGenerating hypotheses...\n")
         selected_hypotheses = await generate_hypotheses_in_parallel(research_goal)
         print(f"\n--- Selected Hypotheses ---\n{selected_hypotheses}\n")
         
@@ -261,7 +662,7 @@ async def main():
         print(f"\n--- Active Research Hypotheses ---\n{active_hypotheses}\n")
         
         # Pass the active hypotheses to the supervisor for further processing
-        research_input = f"Research Goal: {research_goal}\n\nActive Research Hypotheses:\n{active_hypotheses}\n\nPlease continue the research process with these hypotheses."
+        research_input = SUPERVISOR_TEMPLATE.format_map({"research_goal": research_goal, "hypotheses": active_hypotheses})
         
         print("\nSupervisor agent starting orchestration process...\n")
         
@@ -269,32 +670,33 @@ async def main():
         result = Runner.run_streamed(supervisor_agent, research_input)
         
         # Process and display results as they stream in
-        current_agent = "supervisor_agent"
-        print(f"\n--- Now working: {current_agent} ---")
+        state = StreamState(current_agent="supervisor_agent", last_flush=time.monotonic())
+        print(f"\n--- Now working: {state.current_agent} ---")
         
-        final_output = ""
         async for event in result.stream_events():
             # Display raw text as it's generated
-            if isinstance(event, RawResponsesStreamEvent):
-                data = event.data
-                if isinstance(data, ResponseTextDeltaEvent):
-                    print(data.delta, end="", flush=True)
-                    # Capture the final output as it's being streamed
-                    if current_agent == "supervisor_agent":
-                        final_output += data.delta
-                elif isinstance(data, ResponseContentPartDoneEvent):
-                    print("\n")
+            if type(event) is RawResponsesStreamEvent:
+                handler = STREAM_HANDLERS.get(type(event.data))
+                if handler:
+                    handler(event.data, state)
             
             # When an agent changes, announce it
-            if hasattr(event, 'agent_name') and event.agent_name != current_agent:
-                current_agent = event.agent_name
-                print(f"\n\n--- Now working: {current_agent} ---\n")
+            if hasattr(event, 'agent_name') and event.agent_name != state.current_agent:
+                state.current_agent = event.agent_name
+                print(f"\n\n--- Now working: {state.current_agent} ---\n")
         
-        # Display final research overview
+        # Display final research overview; the runner keeps the supervisor's final output
+        final_output = result.final_output or ""
         print(f"\n\n=== Final Research Overview ===\n{final_output}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop schedules the streaming and fan-out callbacks faster than the default loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
 
 
 
@@ -0,0 +1,257 @@
+import asyncio
+import importlib.util
+import json
+import os
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+# backend.workflows' __init__ imports a workflow module that is not in this tree, so load the file directly
+_spec = importlib.util.spec_from_file_location(
+    "co_scientist",
+    os.path.join(os.path.dirname(__file__), os.pardir, "backend", "workflows", "co_scientist.py"),
+)
+co_scientist = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(co_scientist)
+
+
+@pytest.fixture
+def generation_output(monkeypatch):
+    """Make the batched generation call return the given text without contacting the API"""
+    def set_output(text):
+        async def fake_bounded_run(agent, input):
+            return SimpleNamespace(new_items=[])
+        monkeypatch.setattr(co_scientist, "bounded_run", fake_bounded_run)
+        monkeypatch.setattr(co_scientist, "message_text", lambda items: text)
+    return set_output
+
+
+async def test_batched_sets_split_on_plain_markers(generation_output):
+    generation_output(
+        "===SET 1===\nH1a\nH1b\n===SET 2===\nH2a\n===SET 3===\nH3a\n"
+        "===SELECTION===\n1. H1a because it is novel"
+    )
+    sets, selection = await co_scientist.generate_hypothesis_sets_batched("goal")
+    assert sets == ["H1a\nH1b", "H2a", "H3a"]
+    assert selection == "1. H1a because it is novel"
+
+
+async def test_batched_sets_split_on_markdown_wrapped_markers(generation_output):
+    generation_output(
+        "Intro text\n\n**===SET 1===**\nH1a\n\n## === SET 2 ===\nH2a\n\n__===SET 3===__\nH3a\n\n"
+        "**===SELECTION===**\n1. H2a because it is transformative"
+    )
+    sets, selection = await co_scientist.generate_hypothesis_sets_batched("goal")
+    assert sets == ["H1a", "H2a", "H3a"]
+    assert selection == "1. H2a because it is transformative"
+
+
+async def test_batched_sets_without_markers_fall_back_to_one_set(generation_output):
+    generation_output("H1\nH2\nH3")
+    sets, selection = await co_scientist.generate_hypothesis_sets_batched("goal")
+    assert sets == ["H1\nH2\nH3"]
+    assert selection is None
+
+
+async def test_inline_selection_marker_is_not_trusted(generation_output):
+    generation_output("===SET 1===\nH1 mentions ===SELECTION=== inline\n===SET 2===\nH2")
+    sets, selection = await co_scientist.generate_hypothesis_sets_batched("goal")
+    assert sets == ["H1 mentions ===SELECTION=== inline", "H2"]
+    assert selection is None
+
+
+async def test_inline_set_marker_does_not_split_a_set(generation_output):
+    generation_output("===SET 1===\nH1 is unlike the ===SET 2=== ideas\n===SET 2===\nH2")
+    sets, selection = await co_scientist.generate_hypothesis_sets_batched("goal")
+    assert sets == ["H1 is unlike the ===SET 2=== ideas", "H2"]
+    assert selection is None
+
+
+def test_parse_selection_accepts_fenced_json():
+    selection = co_scientist.parse_selection(
+        '```json\n[{"id": "H1", "statement": "α-synuclein aggregates at 37 °C", "rationale": "novel"}]\n```'
+    )
+    assert selection == co_scientist.SelectedHypotheses(
+        items=[co_scientist.Hypothesis(id="H1", statement="α-synuclein aggregates at 37 °C", rationale="novel")]
+    )
+
+
+@pytest.mark.parametrize("text", ["1. H1 because it is novel", "[]", '{"id": "H1"}', '[{"id": "H1"}]'])
+def test_parse_selection_rejects_malformed_selections(text):
+    assert co_scientist.parse_selection(text) is None
+
+
+def test_format_selection_keeps_non_ascii_text():
+    selection = co_scientist.SelectedHypotheses(
+        items=[co_scientist.Hypothesis(id="H1", statement="α-synuclein aggregates at 37 °C", rationale="novel")]
+    )
+    assert "α-synuclein aggregates at 37 °C" in co_scientist.format_selection(selection)
+
+
+async def test_fused_and_selector_paths_return_the_same_format(generation_output, monkeypatch):
+    hypothesis = co_scientist.Hypothesis(id="H1", statement="statement", rationale="rationale")
+    expected = co_scientist.format_selection(co_scientist.SelectedHypotheses(items=[hypothesis]))
+    
+    generation_output('===SET 1===\nH1\n===SELECTION===\n[{"id": "H1", "statement": "statement", "rationale": "rationale"}]')
+    assert await co_scientist.generate_hypotheses_in_parallel("goal") == expected
+    
+    generation_output("===SET 1===\nH1\n===SELECTION===\n1. H1 because it is novel")
+    async def fake_bounded_run(agent, input):
+        selection = co_scientist.SelectedHypotheses(items=[hypothesis])
+        return SimpleNamespace(new_items=[], final_output=selection if agent.name == "hypothesis_selector_agent" else None)
+    monkeypatch.setattr(co_scientist, "bounded_run", fake_bounded_run)
+    assert await co_scientist.generate_hypotheses_in_parallel("goal") == expected
+
+
+@pytest.fixture
+def evaluator_calls(monkeypatch):
+    """Record evaluator runs, answering each with an all_active verdict"""
+    calls = []
+    async def fake_bounded_run(agent, input):
+        calls.append(agent.name)
+        evaluation = co_scientist.HypothesisEvaluation(status="all_active", feedback="", active_areas=[], outdated_areas=[])
+        return SimpleNamespace(final_output=evaluation)
+    monkeypatch.setattr(co_scientist, "bounded_run", fake_bounded_run)
+    return calls
+
+
+async def test_bare_recent_years_do_not_skip_evaluation(evaluator_calls):
+    year = date.today().year
+    hypotheses = f"Deploy by {year} a sensor network; pilot in {year - 1}-{year} cohorts."
+    await co_scientist.evaluate_and_refine_hypotheses("goal", hypotheses)
+    assert evaluator_calls == ["hypothesis_evaluator"]
+
+
+async def test_repeated_citations_count_once(evaluator_calls):
+    year = date.today().year
+    hypotheses = f"H1 (Smith et al., {year}). H2 (Smith et al., {year}). H3 arXiv:{year % 100:02d}01.12345 and arXiv:{year % 100:02d}01.12345."
+    await co_scientist.evaluate_and_refine_hypotheses("goal", hypotheses)
+    assert evaluator_calls == ["hypothesis_evaluator"]
+
+
+async def test_recent_citation_list_skips_evaluation(evaluator_calls):
+    year = date.today().year
+    hypotheses = (
+        f"H1 builds on (Smith et al., {year}; Lee & Park, {year - 1}).\n"
+        f"H2 extends Garcia et al. ({year - 2}).\n"
+        f"H3 follows arXiv:{year % 100:02d}03.04567."
+    )
+    assert await co_scientist.evaluate_and_refine_hypotheses("goal", hypotheses) == hypotheses
+    assert evaluator_calls == []
+
+
+def test_context_window_keeps_the_whole_latest_round():
+    items = ["init", "fb1", "msg1", "fb2", "rs_a", "ws_a", "rs_b", "ws_b", "rs_c", "ws_c", "msg2"]
+    assert co_scientist.context_window(items, 3) == ["init", "fb2", "rs_a", "ws_a", "rs_b", "ws_b", "rs_c", "ws_c", "msg2"]
+    assert co_scientist.context_window(["init"], 1) == ["init"]
+
+
+async def test_refine_loop_sends_reasoning_and_search_items_together(monkeypatch):
+    verdicts = iter(["needs_refinement", "needs_refinement", "all_active"])
+    rounds = iter(["r1", "r2"])
+    evaluator_inputs = []
+    
+    async def fake_bounded_run(agent, input):
+        if agent.name == "hypothesis_evaluator":
+            evaluator_inputs.append(list(input))
+            evaluation = co_scientist.HypothesisEvaluation(
+                status=next(verdicts), feedback="stale", active_areas=[], outdated_areas=["area"]
+            )
+            return SimpleNamespace(final_output=evaluation)
+        round_id = next(rounds)
+        new_items = [
+            SimpleNamespace(to_input_item=lambda name=name: f"{name}_{round_id}")
+            for name in ("rs_a", "ws_a", "rs_b", "ws_b", "rs_c", "ws_c", "msg")
+        ]
+        return SimpleNamespace(new_items=new_items)
+    monkeypatch.setattr(co_scientist, "bounded_run", fake_bounded_run)
+    monkeypatch.setattr(co_scientist, "message_text", lambda items: "refined")
+    
+    await co_scientist.evaluate_and_refine_hypotheses("goal", "hypotheses")
+    
+    feedback = {"content": "Feedback on research currency: stale", "role": "user"}
+    initial = evaluator_inputs[0][0]
+    assert evaluator_inputs[1] == [initial, feedback, "rs_a_r1", "ws_a_r1", "rs_b_r1", "ws_b_r1", "rs_c_r1", "ws_c_r1", "msg_r1"]
+    assert evaluator_inputs[2] == [initial, feedback, "rs_a_r2", "ws_a_r2", "rs_b_r2", "ws_b_r2", "rs_c_r2", "ws_c_r2", "msg_r2"]
+
+
+@pytest.fixture
+def parallel_generation(monkeypatch):
+    """Make each parallel generation call finish after the given delay, keyed by set number"""
+    def set_delays(*delays):
+        async def fake_bounded_run(agent, input):
+            if agent.name == "literature_scout_agent":
+                return SimpleNamespace(final_output="literature")
+            for number, directive in enumerate(co_scientist.GENERATION_SET_DIRECTIVES_NO_SEARCH, 1):
+                if input.endswith(directive):
+                    await asyncio.sleep(delays[number - 1])
+                    return SimpleNamespace(new_items=[f"set {number}"])
+        monkeypatch.setattr(co_scientist, "bounded_run", fake_bounded_run)
+        monkeypatch.setattr(co_scientist, "message_text", lambda items: items[0])
+    return set_delays
+
+
+async def test_quorum_drops_the_slow_third_set(parallel_generation, monkeypatch):
+    monkeypatch.setenv("COSCI_QUORUM", "1")
+    parallel_generation(0.1, 0.2, 5)
+    started = time.monotonic()
+    sets, omitted = await co_scientist.generate_hypothesis_sets_parallel("goal")
+    # The third set gets 1.5x the median of the first two latencies (0.15s), so it is dropped at about 0.23s
+    assert time.monotonic() - started < 1
+    assert sets == ["set 1", "set 2"]
+    assert omitted == 1
+
+
+async def test_quorum_keeps_a_third_set_that_arrives_in_time(parallel_generation, monkeypatch):
+    monkeypatch.setenv("COSCI_QUORUM", "1")
+    # First two at 0.2s give the third a 0.3s deadline
+    parallel_generation(0.2, 0.2, 0.22)
+    assert await co_scientist.generate_hypothesis_sets_parallel("goal") == (["set 1", "set 2", "set 3"], 0)
+
+
+async def test_without_quorum_all_three_sets_are_awaited(parallel_generation, monkeypatch):
+    monkeypatch.delenv("COSCI_QUORUM", raising=False)
+    parallel_generation(0.1, 0.2, 0.6)
+    assert await co_scientist.generate_hypothesis_sets_parallel("goal") == (["set 1", "set 2", "set 3"], 0)
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    """Serve fixed embedding vectors per hypothesis text and record embedding requests"""
+    requests = []
+    def set_vectors(vectors):
+        async def create(model, input):
+            requests.append(input)
+            return SimpleNamespace(data=[SimpleNamespace(embedding=vectors[text]) for text in input])
+        client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+        monkeypatch.setattr(co_scientist, "get_openai_client", lambda: client)
+    set_vectors.requests = requests
+    return set_vectors
+
+
+async def map_relationships(hypotheses):
+    return await co_scientist.map_hypothesis_relationships.on_invoke_tool(None, json.dumps({"hypotheses": hypotheses}))
+
+
+async def test_relationship_map_clusters_at_the_proximity_threshold(embeddings):
+    assert co_scientist.PROXIMITY_THRESHOLD == 0.82
+    embeddings({
+        "alpha": [1.0, 0.0, 0.0],
+        "alpha variant": [0.95, 0.1, 0.0],  # cosine 0.99 with alpha
+        "beta": [0.0, 1.0, 0.0],
+        "near alpha": [0.8, 0.0, 0.6],  # cosine 0.80 with alpha, just under the threshold
+    })
+    output = await map_relationships(["alpha", "alpha variant", "beta", "near alpha"])
+    assert output.startswith("3 clusters among 4 hypotheses")
+    assert "Cluster 1 (similar ideas):\n- [H1] alpha\n- [H2] alpha variant" in output
+    assert "Cluster 2 (distinct):\n- [H3] beta" in output
+    assert "Cluster 3 (distinct):\n- [H4] near alpha" in output
+    assert output.split("Closest pairs:\n")[1].splitlines()[0] == "- H1 ~ H2: 0.99"
+
+
+async def test_relationship_map_needs_two_hypotheses(embeddings):
+    embeddings({})
+    assert await map_relationships(["only one", "  "]) == "At least two hypotheses are needed to map relationships."
+    assert embeddings.requests == []